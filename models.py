@@ -6,11 +6,26 @@ Two core profiles:
   - BuyerProfile: M&A buyer / PE firm data extracted from raw text
 """
 
-from typing import Optional
-from pydantic import BaseModel, field_validator
+import functools
+import math
+import re
+from typing import Any, Optional, get_args, get_origin
 
+import orjson
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
-class CompanyProfile(BaseModel):
+
+class _ConfidenceMixin:
+    """Shared confidence_score check, run once after field validation."""
+
+    def model_post_init(self, __context: Any) -> None:
+        v = self.confidence_score
+        if not 0.0 <= v <= 1.0:
+            raise ValueError(f"confidence_score must be between 0 and 1, got {v}")
+        object.__setattr__(self, "confidence_score", round(v, 4))
+
+
+class CompanyProfile(_ConfidenceMixin, BaseModel):
     """Structured profile of a company extracted from unstructured text."""
 
     company_name: str
@@ -22,13 +37,6 @@ class CompanyProfile(BaseModel):
     description: str
     confidence_score: float
 
-    @field_validator("confidence_score")
-    @classmethod
-    def validate_confidence(cls, v: float) -> float:
-        if not 0.0 <= v <= 1.0:
-            raise ValueError(f"confidence_score must be between 0 and 1, got {v}")
-        return round(v, 4)
-
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -45,7 +53,7 @@ class CompanyProfile(BaseModel):
     }
 
 
-class BuyerProfile(BaseModel):
+class BuyerProfile(_ConfidenceMixin, BaseModel):
     """Structured profile of a buyer / PE firm extracted from unstructured text."""
 
     company_name: str
@@ -56,13 +64,6 @@ class BuyerProfile(BaseModel):
     deal_history: list[str] = []
     confidence_score: float
 
-    @field_validator("confidence_score")
-    @classmethod
-    def validate_confidence(cls, v: float) -> float:
-        if not 0.0 <= v <= 1.0:
-            raise ValueError(f"confidence_score must be between 0 and 1, got {v}")
-        return round(v, 4)
-
     model_config = {
         "json_schema_extra": {
             "example": {
@@ -89,11 +90,114 @@ SCHEMA_REGISTRY = {
     "ventures": BuyerProfile,
 }
 
+# All registry keywords as one alternation, so a filename is scanned once
+# no matter how many keywords there are. The lookahead reports a match at
+# every position (overlaps included), and alternation order = registry order.
+_SCHEMA_RE = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in SCHEMA_REGISTRY) + "))"
+)
+_KEYWORD_PRIORITY = {keyword: i for i, keyword in enumerate(SCHEMA_REGISTRY)}
+
 
 def infer_schema(filename: str) -> type[CompanyProfile] | type[BuyerProfile]:
-    """Infer the appropriate Pydantic schema based on the filename."""
-    name_lower = filename.lower()
-    for keyword, schema in SCHEMA_REGISTRY.items():
-        if keyword in name_lower:
-            return schema
+    """
+    Infer the appropriate Pydantic schema based on the filename.
+    When several keywords appear, the one listed first in SCHEMA_REGISTRY wins.
+    """
+    keywords = [match.group(1) for match in _SCHEMA_RE.finditer(filename.lower())]
+    if keywords:
+        return SCHEMA_REGISTRY[min(keywords, key=_KEYWORD_PRIORITY.__getitem__)]
     return CompanyProfile  # default
+
+
+# Schema lookup by class name, as stored in extractions.schema_type
+SCHEMA_REGISTRY_BY_NAME = {cls.__name__: cls for cls in (CompanyProfile, BuyerProfile)}
+
+
+def profile_from_row(row: Any) -> CompanyProfile | BuyerProfile:
+    """
+    Rebuild a profile from an extractions row without re-running validation.
+    Rows are only written from already-validated models, so model_construct is safe.
+    """
+    schema = SCHEMA_REGISTRY_BY_NAME[row["schema_type"]]
+    return schema.model_construct(**orjson.loads(row["extracted_json"]))
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _repair(annotation: Any, value: Any) -> Any:
+    """
+    Repair one field that failed validation. Only a few known LLM slips are
+    fixed; anything else raises TypeError so the caller re-raises the
+    original ValidationError.
+    """
+    if get_origin(annotation) is list:
+        (item_type,) = get_args(annotation)
+        if item_type is str:
+            if isinstance(value, str):  # "CloudSync, DataBridge" → ["CloudSync", "DataBridge"]
+                return [part.strip() for part in value.split(",") if part.strip()]
+            if isinstance(value, list) and all(map(_is_scalar, value)):
+                return [str(item) for item in value]  # [2021, "2023"] → ["2021", "2023"]
+        raise TypeError(f"cannot repair {value!r} as {annotation}")
+
+    inner = [arg for arg in get_args(annotation) if arg is not type(None)] or [annotation]
+    if inner[0] is int and _is_scalar(value):
+        try:
+            return int(float(str(value).replace(",", "")))  # "1,200" / 1200.0 → 1200
+        except (ValueError, OverflowError):
+            return None  # prose like "about 1.5k" — unknown rather than a wrong number
+    if inner[0] is float and _is_scalar(value):
+        number = float(value)
+        if math.isfinite(number):
+            return min(max(number, 0.0), 1.0)
+    raise TypeError(f"cannot repair {value!r} as {annotation}")
+
+
+@functools.lru_cache(maxsize=None)
+def _field_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def build_profile(
+    schema_class: type[CompanyProfile] | type[BuyerProfile],
+    data: Any,
+) -> CompanyProfile | BuyerProfile:
+    """
+    Validate extracted data into a profile.
+    If validation fails, one repair pass fixes only the fields that failed:
+    comma-separated strings → list[str], "1,200" → 1200 for int fields, and
+    confidence_score cast to float and clamped to 0–1. Fields that passed keep
+    their validated values, unknown keys are dropped, and the result is built
+    with model_construct. Any other mismatch (e.g. a dict for a str field)
+    re-raises the original ValidationError.
+    """
+    try:
+        return schema_class.model_validate(data)
+    except ValidationError as exc:
+        if not isinstance(data, dict):
+            raise
+        validation_error = exc
+
+    failed = {error["loc"][0] for error in validation_error.errors() if error["loc"]}
+    # The 0–1 range check runs in model_post_init, which field errors skip, so
+    # always clamp confidence_score (a no-op for in-range values)
+    failed.add("confidence_score")
+
+    repaired = {}
+    for name, field_info in schema_class.model_fields.items():
+        if name not in data:
+            if field_info.is_required():
+                raise validation_error
+            continue  # model_construct fills the default
+        try:
+            if name in failed:
+                repaired[name] = _repair(field_info.annotation, data[name])
+            else:
+                repaired[name] = _field_adapter(field_info.annotation).validate_python(data[name])
+        except (TypeError, ValueError):
+            raise validation_error from None
+        if repaired[name] is None and field_info.is_required():
+            raise validation_error
+    return schema_class.model_construct(**repaired)
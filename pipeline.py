@@ -4,21 +4,30 @@ Orchestrates: ingest → LLM extraction → Pydantic validation → SQLite stora
 
 Usage:
     python pipeline.py
+
+Heavy dependencies (httpx, pydantic via models, tenacity, dotenv) are imported
+where they are first needed, so config errors are reported without paying for them.
 """
 
-import json
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import hashlib
 import os
-import re
 import sqlite3
-import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import httpx
-from dotenv import load_dotenv
+import orjson
 
-from models import BuyerProfile, CompanyProfile, infer_schema
+if TYPE_CHECKING:
+    import httpx
+    from tenacity import RetryCallState
+
+    from models import BuyerProfile, CompanyProfile
 
 # ── Constants ──────────────────────────────────────────────────────────────────
 DATABRICKS_ENDPOINT = (
@@ -29,6 +38,21 @@ MODEL_VERSION = "databricks-meta-llama-3-3-70b-instruct"
 DB_PATH = "extractions.db"
 SAMPLE_DIR = Path("examples/sample_texts")
 MAX_RETRIES = 2
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # persistent: readers no longer block on writes
+    "PRAGMA synchronous=NORMAL",  # fsync at checkpoints only (safe under WAL)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA busy_timeout=5000",
+)
+CONCURRENCY = 8  # max in-flight LLM requests
+BATCH_SIZE = 4  # max documents packed into one LLM call
+BATCH_TOKEN_BUDGET = 3000  # max estimated input tokens per batched call
+# Completion budget per document; a filled profile fits well inside these
+MAX_OUTPUT_TOKENS = {"CompanyProfile": 600, "BuyerProfile": 900}
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
 
 # ── Colors ─────────────────────────────────────────────────────────────────────
 GREEN = "\033[92m"
@@ -58,6 +82,8 @@ def info(msg: str) -> None:
 # ── Config ─────────────────────────────────────────────────────────────────────
 def load_config() -> dict[str, str]:
     """Load configuration from environment or .env file."""
+    from dotenv import load_dotenv
+
     load_dotenv()
     token = os.getenv("DATABRICKS_TOKEN")
     if not token:
@@ -69,101 +95,363 @@ def load_config() -> dict[str, str]:
 
 
 # ── LLM Extraction ─────────────────────────────────────────────────────────────
-def build_system_prompt(schema_class: type) -> str:
-    """Build a system prompt with explicit field list (not raw JSON schema)."""
+@functools.lru_cache(maxsize=4)
+def build_system_prompt(schema_class: type, batch: bool = False) -> str:
+    """
+    Build a system prompt with explicit field list (not raw JSON schema).
+    With batch=True the model is asked for a JSON array, one object per document.
+    """
     # Build a simple field description instead of the raw JSON schema
     # This prevents the LLM from returning the schema itself as data
     fields = schema_class.model_fields
     field_lines = []
     for name, field_info in fields.items():
-        annotation = str(field_info.annotation).replace("typing.", "")
-        required = "required" if field_info.is_required() else "optional, use null if unknown"
-        field_lines.append(f'  - "{name}": {annotation} ({required})')
+        annotation = field_info.annotation
+        # "str" rather than "<class 'str'>"; generics like list[str] print as-is
+        type_name = (
+            annotation.__name__ if type(annotation) is type
+            else str(annotation).replace("typing.", "")
+        )
+        required = " (required)" if field_info.is_required() else ""
+        field_lines.append(f'  - "{name}": {type_name}{required}')
     fields_str = "\n".join(field_lines)
 
+    if batch:
+        output_spec = (
+            "Documents are marked [[1]], [[2]], ... Return ONLY a JSON array with "
+            "one object per document, in order, each with these fields:\n"
+        )
+        output_name = "JSON array"
+    else:
+        output_spec = "Return ONLY a JSON object with these fields:\n"
+        output_name = "JSON object"
+
     return (
-        "You are a precise data extraction assistant. "
-        "Read unstructured text and extract structured information.\n\n"
-        "Return ONLY a valid JSON object with these fields:\n"
-        f"{fields_str}\n\n"
+        "You are a precise data extraction assistant.\n"
+        f"{output_spec}"
+        f"{fields_str}\n"
         "RULES:\n"
-        "1. Return ONLY the JSON object — no markdown, no code fences, no explanations, no schema.\n"
-        "2. Fill every field with actual extracted data from the text.\n"
-        "3. For fields you cannot determine, use null (for optional) or [] (for lists).\n"
-        "4. confidence_score: float 0.0-1.0 based on extraction certainty.\n"
-        "5. key_products / key_contacts / deal_history: extract as lists from the text.\n"
-        "6. Do NOT return the schema definition — return the EXTRACTED DATA.\n"
-        "7. Do NOT invent or hallucinate data."
+        f"1. Output only the {output_name} with extracted data — no markdown, explanations or schema.\n"
+        "2. Use only facts from the text; null for unknown optional fields, [] for unknown lists.\n"
+        "3. confidence_score: 0.0-1.0, your certainty in the extraction."
     )
 
 
+class _JsonScanner:
+    """
+    Incremental bracket matcher for the first JSON value starting with `opener`
+    ("{" or "["). Text before the opener is skipped and brackets inside strings
+    are ignored. Shared by streaming (chunk by chunk) and final extraction.
+    """
+
+    def __init__(self, opener: str = "{") -> None:
+        self.opener = opener
+        self.closer = "}" if opener == "{" else "]"
+        self.start = -1  # offset of the opener across everything fed so far
+        self.depth = 0
+        self.in_string = self.escape = False
+        self._offset = 0
+
+    def feed(self, chunk: str) -> int:
+        """Scan the next chunk. Returns the index just past the closing bracket, or -1."""
+        for i, ch in enumerate(chunk):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"' and self.depth:
+                self.in_string = True
+            elif ch == self.opener:
+                if not self.depth:
+                    self.start = self._offset + i
+                self.depth += 1
+            elif ch == self.closer and self.depth:
+                self.depth -= 1
+                if not self.depth:
+                    return i + 1
+        self._offset += len(chunk)
+        return -1
+
+
+def _find_json(raw: str, opener: str = "{") -> str:
+    """Return the first balanced JSON value starting with `opener`, or "" if there is none."""
+    scanner = _JsonScanner(opener)
+    end = scanner.feed(raw)
+    return raw[scanner.start : end] if end != -1 else ""
+
+
 def extract_json_from_text(raw: str) -> dict[str, Any]:
-    """Extract JSON object from LLM response, handling occasional markdown fences."""
-    # Strip markdown code fences if present
-    cleaned = re.sub(r"```(?:json)?\s*", "", raw).strip().rstrip("`").strip()
-    # Find the first JSON object
-    match = re.search(r"\{.*\}", cleaned, re.DOTALL)
-    if not match:
+    """Extract JSON object from LLM response, ignoring any markdown fences or prose around it."""
+    found = _find_json(raw)
+    if not found:
         raise ValueError(f"No JSON object found in LLM response: {raw[:200]!r}")
-    return json.loads(match.group())
+    return orjson.loads(found)
+
+
+def extract_json_array_from_text(raw: str) -> list[Any]:
+    """Extract a JSON array from a batched LLM response, ignoring surrounding fences or prose."""
+    found = _find_json(raw, opener="[")
+    if not found:
+        raise ValueError(f"No JSON array found in LLM response: {raw[:200]!r}")
+    return orjson.loads(found)
+
+
+async def read_streamed_content(response: httpx.Response, opener: str = "{") -> str:
+    """
+    Assemble the completion text from a streamed (SSE) chat response.
+    Stops reading as soon as the first top-level JSON value starting with
+    `opener` ("{" or "[") is closed, so any trailing tokens the model would
+    still generate are never waited for.
+    """
+    scanner = _JsonScanner(opener)
+    parts: list[str] = []
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            break
+        chunk = orjson.loads(payload)
+        if not isinstance(chunk, dict):
+            raise ValueError(f"Unexpected stream chunk: {payload[:200]!r}")
+        choices = chunk.get("choices")
+        if not choices:
+            continue
+        delta = choices[0]["delta"].get("content") or ""
+        end = scanner.feed(delta)
+        if end != -1:
+            parts.append(delta[:end])
+            break
+        parts.append(delta)
+    return "".join(parts)
+
+
+async def request_completion(
+    messages: list[dict[str, str]],
+    max_tokens: int,
+    token: str,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    opener: str = "{",
+) -> str:
+    """
+    Send one streaming chat request to Databricks and return the completion text.
+    Holds a semaphore slot for the duration of the request.
+    """
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+    }
+    body = {"messages": messages, "max_tokens": max_tokens, "stream": True}
+    async with semaphore, client.stream(
+        "POST", DATABRICKS_ENDPOINT, headers=headers, content=orjson.dumps(body)
+    ) as response:
+        if response.is_error:
+            await response.aread()  # load the body for the error message
+        response.raise_for_status()
+        return await read_streamed_content(response, opener)
+
 
+def is_retryable(exc: BaseException) -> bool:
+    """Retry on 429/5xx, network errors and unparseable or invalid model output."""
+    import httpx
 
-def extract_to_json(
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.TransportError, KeyError, ValueError))
+
+
+def log_failed_attempt(retry_state: RetryCallState) -> None:
+    import httpx
+
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, httpx.HTTPStatusError):
+        err(f"  HTTP {exc.response.status_code}: {exc.response.text[:200]}")
+    elif isinstance(exc, httpx.TransportError):
+        err(f"  Network error: {exc!r}")
+    else:
+        err(f"  Parse error: {exc}")
+
+
+def log_retry(retry_state: RetryCallState) -> None:
+    wait = retry_state.next_action.sleep
+    warn(f"  Retry {retry_state.attempt_number}/{MAX_RETRIES} after {wait:.1f}s...")
+
+
+async def extract_to_json(
     raw_text: str,
     schema_class: type[CompanyProfile] | type[BuyerProfile],
     token: str,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    cache_rows: list[tuple[str, str]],
+    db_path: str = DB_PATH,
 ) -> CompanyProfile | BuyerProfile:
     """
     Call Databricks Llama 3.3 70B to extract structured data from raw text.
     Returns a validated Pydantic model instance.
-    Retries up to MAX_RETRIES times on API or parse failure.
+    Responses are cached in SQLite by prompt + text hash, so unchanged inputs
+    skip the API call on later runs.
+    Retries up to MAX_RETRIES times on transient API or parse failure, with
+    jittered exponential backoff so concurrent requests don't retry in lockstep.
     """
+    key = cache_key(schema_class, raw_text)
+    cached = load_cached_profile(key, schema_class, db_path)
+    if cached is not None:
+        return cached
+
+    import httpx
+
+    from models import build_profile
+    from tenacity import (
+        RetryError,
+        retry,
+        retry_if_exception,
+        stop_after_attempt,
+        wait_random_exponential,
+    )
+
     system_prompt = build_system_prompt(schema_class)
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    body = {
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Extract structured data from this text:\n\n{raw_text}"},
-        ],
-        "max_tokens": 2000,
-    }
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Extract structured data from this text:\n\n{raw_text}"},
+    ]
+
+    @retry(
+        retry=retry_if_exception(is_retryable),
+        wait=wait_random_exponential(multiplier=1, max=16),
+        stop=stop_after_attempt(MAX_RETRIES + 1),  # 1 initial + MAX_RETRIES retries
+        after=log_failed_attempt,
+        before_sleep=log_retry,
+    )
+    async def _call_once() -> CompanyProfile | BuyerProfile:
+        content = await request_completion(
+            messages, MAX_OUTPUT_TOKENS[schema_class.__name__], token, client, semaphore
+        )
+        extracted = extract_json_from_text(content)
+        profile = build_profile(schema_class, extracted)
+        cache_put(key, content, cache_rows)
+        return profile
+
+    try:
+        return await _call_once()
+    except RetryError as exc:
+        last_exc = exc.last_attempt.exception()
+        raise RuntimeError(
+            f"Failed after {MAX_RETRIES + 1} attempts. Last error: {last_exc}"
+        ) from last_exc
+    except httpx.HTTPStatusError as exc:
+        # Not retryable (e.g. 400/401), so log_failed_attempt never saw it;
+        # keep the Databricks error body in the message
+        raise RuntimeError(
+            f"HTTP {exc.response.status_code}: {exc.response.text[:200]}"
+        ) from exc
+
+
+async def extract_batch(
+    raw_texts: list[str],
+    schema_class: type[CompanyProfile] | type[BuyerProfile],
+    token: str,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    cache_rows: list[tuple[str, str]],
+    db_path: str = DB_PATH,
+) -> list[CompanyProfile | BuyerProfile | Exception]:
+    """
+    Extract several documents of the same schema with a single LLM call.
+    Returns one validated model (or the exception that stopped it) per text, in order.
+    Cached documents are answered from the response cache and left out of the
+    batch; documents the batched call cannot produce a valid profile for fall
+    back to individual extract_to_json calls.
+    """
+    import httpx
+
+    from models import build_profile
+
+    keys = [cache_key(schema_class, text) for text in raw_texts]
+    results: list[CompanyProfile | BuyerProfile | Exception | None] = [
+        load_cached_profile(key, schema_class, db_path) for key in keys
+    ]
+    uncached = [i for i, result in enumerate(results) if result is None]
 
-    last_exc: Exception | None = None
-    for attempt in range(1, MAX_RETRIES + 2):  # 1 initial + MAX_RETRIES retries
+    if len(uncached) > 1:
+        documents = "\n\n".join(
+            f"[[{n}]]\n{raw_texts[i]}" for n, i in enumerate(uncached, 1)
+        )
+        messages = [
+            {"role": "system", "content": build_system_prompt(schema_class, batch=True)},
+            {"role": "user", "content": f"Extract structured data from each document:\n\n{documents}"},
+        ]
         try:
-            if attempt > 1:
-                wait = attempt * 2
-                warn(f"  Retry {attempt - 1}/{MAX_RETRIES} after {wait}s...")
-                time.sleep(wait)
-
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(DATABRICKS_ENDPOINT, headers=headers, json=body)
-                response.raise_for_status()
-
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-            extracted = extract_json_from_text(content)
-            return schema_class(**extracted)
-
-        except httpx.HTTPStatusError as exc:
-            last_exc = exc
-            err(f"  HTTP {exc.response.status_code}: {exc.response.text[:200]}")
-        except (json.JSONDecodeError, KeyError, ValueError) as exc:
-            last_exc = exc
-            err(f"  Parse error: {exc}")
-
-    raise RuntimeError(
-        f"Failed after {MAX_RETRIES + 1} attempts. Last error: {last_exc}"
+            content = await request_completion(
+                messages,
+                MAX_OUTPUT_TOKENS[schema_class.__name__] * len(uncached),
+                token,
+                client,
+                semaphore,
+                opener="[",
+            )
+            items = extract_json_array_from_text(content)
+            if len(items) != len(uncached):
+                raise ValueError(f"expected {len(uncached)} objects, got {len(items)}")
+            for n, (i, item) in enumerate(zip(uncached, items), 1):
+                try:
+                    results[i] = build_profile(schema_class, item)
+                except (TypeError, ValueError) as exc:
+                    warn(f"  Batch item {n} invalid: {exc}")
+                    continue
+                cache_put(keys[i], orjson.dumps(item).decode(), cache_rows)
+        except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, ValueError) as exc:
+            warn(f"  Batch of {len(uncached)} failed ({exc}); falling back to single calls")
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    fallbacks = await asyncio.gather(
+        *(
+            extract_to_json(
+                raw_texts[i], schema_class, token, client, semaphore, cache_rows, db_path
+            )
+            for i in pending
+        ),
+        return_exceptions=True,
     )
+    for i, outcome in zip(pending, fallbacks):
+        results[i] = outcome
+    return results
 
 
 # ── Storage ────────────────────────────────────────────────────────────────────
+_connections: dict[str, sqlite3.Connection] = {}
+
+# Kept as constants so every flush on the cached connection hits
+# sqlite3's prepared-statement cache instead of recompiling the INSERTs.
+INSERT_EXTRACTION_SQL = """
+    INSERT INTO extractions
+        (source_file, schema_type, company_name, industry,
+         extracted_json, confidence_score, model_version, extracted_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_CACHE_SQL = "INSERT OR REPLACE INTO cache (key, content) VALUES (?, ?)"
+
+
+def get_connection(db_path: str = DB_PATH) -> sqlite3.Connection:
+    """Return the cached connection for db_path, opening and tuning it on first use."""
+    conn = _connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        atexit.register(conn.close)
+        _connections[db_path] = conn
+    return conn
+
+
 def init_db(db_path: str) -> None:
     """Create SQLite tables if they don't exist."""
-    with sqlite3.connect(db_path) as conn:
+    conn = get_connection(db_path)
+    with conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS extractions (
                 id             INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -177,64 +465,139 @@ def init_db(db_path: str) -> None:
                 extracted_at   TEXT    NOT NULL
             )
         """)
-        conn.commit()
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_source ON extractions(source_file)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_extractions_schema_conf "
+            "ON extractions(schema_type, confidence_score DESC)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+
+
+def cache_key(schema_class: type, raw_text: str) -> str:
+    """Response-cache key: SHA-256 over model, system prompt and input text."""
+    payload = f"{MODEL_VERSION}\n{build_system_prompt(schema_class)}\n{raw_text}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_put(key: str, content: str, cache_rows: list[tuple[str, str]]) -> None:
+    """Queue an LLM response that produced a valid profile for the next flush_results."""
+    cache_rows.append((key, content))
+
+
+def load_cached_profile(
+    key: str,
+    schema_class: type[CompanyProfile] | type[BuyerProfile],
+    db_path: str = DB_PATH,
+) -> CompanyProfile | BuyerProfile | None:
+    """Return the validated profile for a cached response, or None on a miss."""
+    row = get_connection(db_path).execute(
+        "SELECT content FROM cache WHERE key = ?", (key,)
+    ).fetchone()
+    if row is None:
+        return None
+    from models import build_profile
+
+    try:
+        return build_profile(schema_class, extract_json_from_text(row[0]))
+    except (TypeError, ValueError):
+        return None  # stale entry (e.g. schema changed) — treat as a miss
 
 
 def store_result(
     profile: CompanyProfile | BuyerProfile,
     source_file: str,
+    rows: list[tuple],
+) -> None:
+    """Queue an extraction result with full lineage for the next flush_results."""
+    rows.append(
+        (
+            source_file,
+            type(profile).__name__,
+            profile.company_name,
+            profile.industry,
+            orjson.dumps(profile.model_dump(mode="json")).decode(),
+            profile.confidence_score,
+            MODEL_VERSION,
+            datetime.now(timezone.utc).isoformat(),
+        )
+    )
+
+
+def flush_results(
+    rows: list[tuple],
+    cache_rows: list[tuple[str, str]],
     db_path: str = DB_PATH,
 ) -> None:
-    """Insert an extraction result with full lineage into SQLite."""
-    schema_type = type(profile).__name__
-    extracted_at = datetime.now(timezone.utc).isoformat()
+    """Insert all queued results and cache entries into SQLite in a single transaction."""
+    conn = get_connection(db_path)
+    with conn:
+        conn.executemany(INSERT_EXTRACTION_SQL, rows)
+        conn.executemany(INSERT_CACHE_SQL, cache_rows)
 
-    with sqlite3.connect(db_path) as conn:
-        conn.execute(
-            """
-            INSERT INTO extractions
-                (source_file, schema_type, company_name, industry,
-                 extracted_json, confidence_score, model_version, extracted_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                source_file,
-                schema_type,
-                profile.company_name,
-                profile.industry,
-                profile.model_dump_json(),
-                profile.confidence_score,
-                MODEL_VERSION,
-                extracted_at,
-            ),
-        )
-        conn.commit()
+
+# ── Batch Processing ───────────────────────────────────────────────────────────
+def estimate_tokens(filepath: Path) -> int:
+    """Rough token count for budgeting (~4 bytes per token for English text)."""
+    return filepath.stat().st_size // 4 + 1
 
 
-# ── Per-file Processing ────────────────────────────────────────────────────────
-def process_file(
+def plan_batches(
+    txt_files: list[Path],
+) -> list[tuple[type[CompanyProfile] | type[BuyerProfile], list[Path]]]:
+    """
+    Group files by inferred schema and pack each group into batches of at most
+    BATCH_SIZE documents and BATCH_TOKEN_BUDGET input tokens. Sizes come from
+    file metadata, so no file has to be read before batching.
+    """
+    from models import infer_schema
+
+    by_schema: dict[type, list[Path]] = {}
+    for filepath in txt_files:
+        by_schema.setdefault(infer_schema(filepath.name), []).append(filepath)
+
+    batches = []
+    for schema_class, docs in by_schema.items():
+        current: list[Path] = []
+        current_tokens = 0
+        for doc in docs:
+            doc_tokens = estimate_tokens(doc)
+            if current and (
+                len(current) >= BATCH_SIZE or current_tokens + doc_tokens > BATCH_TOKEN_BUDGET
+            ):
+                batches.append((schema_class, current))
+                current, current_tokens = [], 0
+            current.append(doc)
+            current_tokens += doc_tokens
+        if current:
+            batches.append((schema_class, current))
+    return batches
+
+
+def record_result(
     filepath: Path,
     schema_class: type[CompanyProfile] | type[BuyerProfile],
-    token: str,
-    db_path: str = DB_PATH,
+    outcome: CompanyProfile | BuyerProfile | Exception,
+    rows: list[tuple],
 ) -> dict[str, Any]:
-    """Read → extract → validate → store one file. Returns a result summary dict."""
-    info(f"Processing: {filepath.name}  [{schema_class.__name__}]")
-    raw_text = filepath.read_text(encoding="utf-8")
-
+    """Queue one file's extraction (if it succeeded). Returns a result summary dict."""
     try:
-        profile = extract_to_json(raw_text, schema_class, token)
-        store_result(profile, str(filepath), db_path)
-        ok(f"  {profile.company_name} — confidence: {profile.confidence_score:.2f}")
+        if isinstance(outcome, Exception):
+            raise outcome
+        store_result(outcome, str(filepath), rows)
+        ok(f"  {filepath.name}: {outcome.company_name} — confidence: {outcome.confidence_score:.2f}")
         return {
             "file": filepath.name,
-            "company": profile.company_name,
+            "company": outcome.company_name,
             "schema": schema_class.__name__,
-            "confidence": profile.confidence_score,
+            "confidence": outcome.confidence_score,
             "status": "✅ OK",
         }
     except Exception as exc:
-        err(f"  Failed: {exc}")
+        err(f"  {filepath.name} failed: {exc}")
         return {
             "file": filepath.name,
             "company": "—",
@@ -244,6 +607,94 @@ def process_file(
         }
 
 
+async def process_batch(
+    batch: list[Path],
+    schema_class: type[CompanyProfile] | type[BuyerProfile],
+    token: str,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    rows: list[tuple],
+    cache_rows: list[tuple[str, str]],
+    db_path: str = DB_PATH,
+) -> list[dict[str, Any]]:
+    """Read → extract → validate → queue a batch of files. Returns one summary dict per file."""
+    for filepath in batch:
+        info(f"Processing: {filepath.name}  [{schema_class.__name__}]")
+
+    # Read in worker threads before waiting for an LLM slot, so this batch's
+    # files load while other batches' requests are still in flight
+    outcomes: list[Any] = await asyncio.gather(
+        *(asyncio.to_thread(filepath.read_text, encoding="utf-8") for filepath in batch),
+        return_exceptions=True,
+    )
+
+    # Any failure becomes that file's outcome; it never takes down the whole run
+    readable = [i for i, outcome in enumerate(outcomes) if not isinstance(outcome, Exception)]
+    if readable:
+        try:
+            extracted = await extract_batch(
+                [outcomes[i] for i in readable],
+                schema_class,
+                token,
+                client,
+                semaphore,
+                cache_rows,
+                db_path,
+            )
+        except Exception as exc:
+            extracted = [exc] * len(readable)
+        for i, outcome in zip(readable, extracted):
+            outcomes[i] = outcome
+
+    return [
+        record_result(filepath, schema_class, outcome, rows)
+        for filepath, outcome in zip(batch, outcomes)
+    ]
+
+
+async def process_all(
+    txt_files: list[Path],
+    token: str,
+    db_path: str = DB_PATH,
+) -> list[dict[str, Any]]:
+    """
+    Process all files in concurrent batches, at most CONCURRENCY LLM calls in
+    flight, then store every successful extraction and new cache entry in one
+    SQLite transaction.
+    """
+    import httpx
+
+    rows: list[tuple] = []
+    cache_rows: list[tuple[str, str]] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    # One pooled HTTP/2 client for the whole run: TLS is negotiated once and
+    # concurrent requests are multiplexed over the kept-alive connection.
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+    )
+    async with httpx.AsyncClient(http2=True, timeout=60.0, limits=limits) as client:
+        tasks = [
+            process_batch(
+                batch, schema_class, token, client, semaphore, rows, cache_rows, db_path
+            )
+            for schema_class, batch in plan_batches(txt_files)
+        ]
+        batch_results = await asyncio.gather(*tasks)
+
+    # Report in file order regardless of how files were grouped into batches
+    order = {filepath.name: i for i, filepath in enumerate(txt_files)}
+    results = [result for batch in batch_results for result in batch]
+
+    try:
+        flush_results(rows, cache_rows, db_path)
+    except sqlite3.Error as exc:
+        err(f"Failed to store results in {db_path}: {exc}")
+        for result in results:
+            if "OK" in result["status"]:
+                result["status"] = f"❌ {type(exc).__name__}"
+    return sorted(results, key=lambda r: order[r["file"]])
+
+
 # ── Main ───────────────────────────────────────────────────────────────────────
 def main() -> None:
     print(f"\n{BOLD}{CYAN}{'═' * 60}{RESET}")
@@ -269,13 +720,9 @@ def main() -> None:
 
     info(f"Found {len(txt_files)} file(s) to process\n")
 
-    # Process each file
-    results = []
-    for filepath in txt_files:
-        schema_class = infer_schema(filepath.name)
-        result = process_file(filepath, schema_class, config["token"])
-        results.append(result)
-        print()
+    # Process all files in concurrent batches
+    results = asyncio.run(process_all(txt_files, config["token"], DB_PATH))
+    print()
 
     # Summary table
     print(f"{BOLD}{CYAN}{'─' * 60}{RESET}")
@@ -6,132 +6,134 @@ Usage:
     python view_results.py --no-open  # generates without opening
 """
 
-import html
-import json
+import io
 import sqlite3
 import sys
 import subprocess
 import platform
 from pathlib import Path
+from typing import TextIO
+
+import jinja2
+import orjson
 
 DB_PATH = "extractions.db"
 OUTPUT = "output.html"
+CARD_QUERY = """
+    SELECT source_file, schema_type, extracted_json, confidence_score,
+           model_version, extracted_at
+    FROM extractions ORDER BY id
+"""
+EMPTY_HTML = "<html><body><h1>No extractions yet. Run: python pipeline.py</h1></body></html>"
 
 
-def generate_html(db_path: str = DB_PATH) -> str:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    rows = conn.execute("SELECT * FROM extractions ORDER BY id").fetchall()
-    conn.close()
-
-    if not rows:
-        return "<html><body><h1>No extractions yet. Run: python pipeline.py</h1></body></html>"
-
-    cards = ""
-    for r in rows:
-        data = json.loads(r["extracted_json"])
-        fname = r["source_file"].split("/")[-1]
-        conf = r["confidence_score"]
-        conf_color = "#00ff88" if conf >= 0.9 else "#ffaa00" if conf >= 0.7 else "#ff4444"
-
-        # Build detail rows
-        details = ""
-        if r["schema_type"] == "CompanyProfile":
-            details = f"""
-            <div class="field"><span class="label">Headquarters</span>{data.get('headquarters', 'N/A')}</div>
-            <div class="field"><span class="label">Employees</span>{data.get('employee_count', 'N/A'):,}</div>
-            <div class="field"><span class="label">Revenue</span>{data.get('revenue_range', 'N/A')}</div>
-            <div class="field"><span class="label">Products</span>{', '.join(data.get('key_products', []))}</div>
-            """
-        else:
-            contacts = ", ".join(f"{c.get('name','?')} ({c.get('title','?')})" for c in data.get("key_contacts", []))
-            deals = "<br>".join(data.get("deal_history", []))
-            interests = ", ".join(data.get("acquisition_interests", []))
-            details = f"""
-            <div class="field"><span class="label">Budget</span>{data.get('budget_range', 'N/A')}</div>
-            <div class="field"><span class="label">Interests</span>{interests}</div>
-            <div class="field"><span class="label">Contacts</span>{contacts}</div>
-            <div class="field"><span class="label">Deals</span>{deals}</div>
-            """
-
-        pretty_json = html.escape(json.dumps(data, indent=2, ensure_ascii=False))
-
-        cards += f"""
-        <div class="card">
-            <div class="card-header">
-                <div>
-                    <h2>{data.get('company_name', 'Unknown')}</h2>
-                    <span class="tag">{data.get('industry', 'N/A')}</span>
-                    <span class="tag schema">{r['schema_type']}</span>
-                </div>
-                <div class="confidence" style="border-color: {conf_color}; color: {conf_color}">
-                    {conf:.0%}
-                </div>
-            </div>
-            <div class="card-body">
-                <div class="meta">
-                    <span>📄 {fname}</span>
-                    <span>🤖 {r['model_version']}</span>
-                    <span>🕐 {r['extracted_at'][:19]}</span>
-                </div>
-                {details}
-                <details>
-                    <summary>View raw JSON</summary>
-                    <pre>{pretty_json}</pre>
-                </details>
-            </div>
-        </div>
-        """
-
-    success = len(rows)
-    avg_conf = sum(r["confidence_score"] for r in rows) / len(rows)
-
-    return f"""<!DOCTYPE html>
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en"><head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <title>Extraction Results — Unstructured → JSON Pipeline</title>
 <style>
-* {{ box-sizing: border-box; margin: 0; padding: 0; }}
-body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
-        background: #0f0f1a; color: #e0e0e0; padding: 24px; }}
-.container {{ max-width: 900px; margin: 0 auto; }}
-h1 {{ color: #00d2ff; font-size: 28px; margin-bottom: 4px; }}
-.subtitle {{ color: #888; margin-bottom: 24px; }}
-.stats {{ display: flex; gap: 16px; margin-bottom: 24px; }}
-.stat {{ background: #1a1a2e; border-radius: 10px; padding: 16px 20px; flex: 1; text-align: center; }}
-.stat-value {{ font-size: 28px; font-weight: bold; color: #00ff88; }}
-.stat-label {{ font-size: 12px; color: #888; margin-top: 4px; }}
-.card {{ background: #1a1a2e; border-radius: 12px; margin-bottom: 16px; overflow: hidden; 
-         border: 1px solid #2a2a4a; }}
-.card-header {{ display: flex; justify-content: space-between; align-items: center; 
-                padding: 16px 20px; border-bottom: 1px solid #2a2a4a; }}
-.card-header h2 {{ font-size: 18px; color: #fff; margin-bottom: 6px; }}
-.tag {{ display: inline-block; background: #2a2a4a; color: #aaa; padding: 2px 10px; 
-        border-radius: 12px; font-size: 12px; margin-right: 6px; }}
-.tag.schema {{ background: #1a3a5c; color: #00d2ff; }}
-.confidence {{ width: 56px; height: 56px; border-radius: 50%; border: 3px solid; 
+* { box-sizing: border-box; margin: 0; padding: 0; }
+body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; 
+        background: #0f0f1a; color: #e0e0e0; padding: 24px; }
+.container { max-width: 900px; margin: 0 auto; }
+h1 { color: #00d2ff; font-size: 28px; margin-bottom: 4px; }
+.subtitle { color: #888; margin-bottom: 24px; }
+.stats { display: flex; gap: 16px; margin-bottom: 24px; }
+.stat { background: #1a1a2e; border-radius: 10px; padding: 16px 20px; flex: 1; text-align: center; }
+.stat-value { font-size: 28px; font-weight: bold; color: #00ff88; }
+.stat-label { font-size: 12px; color: #888; margin-top: 4px; }
+.card { background: #1a1a2e; border-radius: 12px; margin-bottom: 16px; overflow: hidden; 
+         border: 1px solid #2a2a4a; }
+.card-header { display: flex; justify-content: space-between; align-items: center; 
+                padding: 16px 20px; border-bottom: 1px solid #2a2a4a; }
+.card-header h2 { font-size: 18px; color: #fff; margin-bottom: 6px; }
+.tag { display: inline-block; background: #2a2a4a; color: #aaa; padding: 2px 10px; 
+        border-radius: 12px; font-size: 12px; margin-right: 6px; }
+.tag.schema { background: #1a3a5c; color: #00d2ff; }
+.confidence { width: 56px; height: 56px; border-radius: 50%; border: 3px solid; 
                display: flex; align-items: center; justify-content: center; 
-               font-weight: bold; font-size: 16px; flex-shrink: 0; }}
-.card-body {{ padding: 16px 20px; }}
-.meta {{ display: flex; gap: 16px; font-size: 12px; color: #666; margin-bottom: 12px; flex-wrap: wrap; }}
-.field {{ margin-bottom: 8px; }}
-.field .label {{ display: inline-block; width: 110px; color: #00d2ff; font-size: 13px; }}
-details {{ margin-top: 12px; }}
-summary {{ cursor: pointer; color: #00d2ff; font-size: 13px; }}
-pre {{ background: #0a0a15; padding: 12px; border-radius: 8px; overflow-x: auto; 
-       font-size: 12px; color: #ccc; margin-top: 8px; white-space: pre-wrap; }}
-footer {{ text-align: center; color: #555; font-size: 12px; margin-top: 32px; }}
-a {{ color: #00d2ff; }}
+               font-weight: bold; font-size: 16px; flex-shrink: 0; }
+.card-body { padding: 16px 20px; }
+.meta { display: flex; gap: 16px; font-size: 12px; color: #666; margin-bottom: 12px; flex-wrap: wrap; }
+.field { margin-bottom: 8px; }
+.field .label { display: inline-block; width: 110px; color: #00d2ff; font-size: 13px; }
+details { margin-top: 12px; }
+summary { cursor: pointer; color: #00d2ff; font-size: 13px; }
+pre { background: #0a0a15; padding: 12px; border-radius: 8px; overflow-x: auto; 
+       font-size: 12px; color: #ccc; margin-top: 8px; white-space: pre-wrap; }
+footer { text-align: center; color: #555; font-size: 12px; margin-top: 32px; }
+a { color: #00d2ff; }
 </style>
 </head><body>
 <div class="container">
     <h1>🔬 Extraction Results</h1>
     <p class="subtitle">Unstructured Text → Structured JSON Pipeline</p>
     
-    <div class="stats">
+"""
+
+PAGE_FOOT = """    
+    <footer>
+        Generated by <a href="https://github.com/manuelarguelles/unstructured-to-json-llm-pipeline">unstructured-to-json-llm-pipeline</a>
+        · Model: Llama 3.3 70B (Databricks)
+    </footer>
+</div>
+</body></html>"""
+
+
+CARD_TEMPLATE = """
+    <div class="card">
+        <div class="card-header">
+            <div>
+                <h2>{{ data.company_name | default("Unknown", true) }}</h2>
+                <span class="tag">{{ data.industry | default("N/A", true) }}</span>
+                <span class="tag schema">{{ r.schema_type }}</span>
+            </div>
+            <div class="confidence" style="border-color: {{ conf_color }}; color: {{ conf_color }}">
+                {{ "{:.0%}".format(conf) }}
+            </div>
+        </div>
+        <div class="card-body">
+            <div class="meta">
+                <span>📄 {{ fname }}</span>
+                <span>🤖 {{ r.model_version }}</span>
+                <span>🕐 {{ r.extracted_at[:19] }}</span>
+            </div>
+            {% if r.schema_type == "CompanyProfile" %}
+            <div class="field"><span class="label">Headquarters</span>{{ data.headquarters | default("N/A", true) }}</div>
+            <div class="field"><span class="label">Employees</span>{{ "{:,}".format(data.employee_count) if data.employee_count is number else "N/A" }}</div>
+            <div class="field"><span class="label">Revenue</span>{{ data.revenue_range | default("N/A", true) }}</div>
+            <div class="field"><span class="label">Products</span>{{ data.key_products | default([], true) | join(", ") }}</div>
+            {% else %}
+            <div class="field"><span class="label">Budget</span>{{ data.budget_range | default("N/A", true) }}</div>
+            <div class="field"><span class="label">Interests</span>{{ data.acquisition_interests | default([], true) | join(", ") }}</div>
+            <div class="field"><span class="label">Contacts</span>
+                {%- for c in data.key_contacts | default([], true) -%}
+                {{ c.name | default("?", true) }} ({{ c.title | default("?", true) }}){% if not loop.last %}, {% endif %}
+                {%- endfor -%}
+            </div>
+            <div class="field"><span class="label">Deals</span>
+                {%- for deal in data.deal_history | default([], true) -%}
+                {{ deal }}{% if not loop.last %}<br>{% endif %}
+                {%- endfor -%}
+            </div>
+            {% endif %}
+            <details>
+                <summary>View raw JSON</summary>
+                <pre>{{ pretty_json }}</pre>
+            </details>
+        </div>
+    </div>
+"""
+
+# Compiled once; autoescape makes every interpolated field HTML-safe
+_CARD = jinja2.Environment(autoescape=True).from_string(CARD_TEMPLATE)
+
+
+def render_stats(count: int, avg_conf: float) -> str:
+    return f"""    <div class="stats">
         <div class="stat">
-            <div class="stat-value">{success}</div>
+            <div class="stat-value">{count}</div>
             <div class="stat-label">Extractions</div>
         </div>
         <div class="stat">
@@ -139,24 +141,66 @@ a {{ color: #00d2ff; }}
             <div class="stat-label">Avg Confidence</div>
         </div>
         <div class="stat">
-            <div class="stat-value" style="color: #fff">{success}/{success}</div>
+            <div class="stat-value" style="color: #fff">{count}/{count}</div>
             <div class="stat-label">Success Rate</div>
         </div>
     </div>
     
-    {cards}
-    
-    <footer>
-        Generated by <a href="https://github.com/manuelarguelles/unstructured-to-json-llm-pipeline">unstructured-to-json-llm-pipeline</a>
-        · Model: Llama 3.3 70B (Databricks)
-    </footer>
-</div>
-</body></html>"""
+"""
+
+
+def render_card(r: sqlite3.Row) -> str:
+    data = orjson.loads(r["extracted_json"])
+    conf = r["confidence_score"]
+    return _CARD.render(
+        r=r,
+        data=data,
+        fname=r["source_file"].split("/")[-1],
+        conf=conf,
+        conf_color="#00ff88" if conf >= 0.9 else "#ffaa00" if conf >= 0.7 else "#ff4444",
+        pretty_json=orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(),
+    )
+
+
+def write_html(out: TextIO, db_path: str = DB_PATH) -> None:
+    """Write the report to `out` one card at a time instead of building one big string."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        count, avg_conf = conn.execute(
+            "SELECT COUNT(*), AVG(confidence_score) FROM extractions"
+        ).fetchone()
+        if not count:
+            out.write(EMPTY_HTML)
+            return
+
+        out.write(PAGE_HEAD)
+        out.write(render_stats(count, avg_conf or 0.0))
+        # Iterate the cursor directly so rows are never all held in memory
+        for r in conn.execute(CARD_QUERY):
+            out.write(render_card(r))
+        out.write(PAGE_FOOT)
+    finally:
+        conn.close()
+
+
+def generate_html(db_path: str = DB_PATH) -> str:
+    buf = io.StringIO()
+    write_html(buf, db_path)
+    return buf.getvalue()
 
 
 def main():
-    html_content = generate_html()
-    Path(OUTPUT).write_text(html_content, encoding="utf-8")
+    # Write to a temp file and swap it in, so a failed query never truncates
+    # the existing report
+    tmp = Path(f"{OUTPUT}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as out:
+            write_html(out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    tmp.replace(OUTPUT)
     print(f"✅ Report generated: {OUTPUT}")
 
     if "--no-open" not in sys.argv: